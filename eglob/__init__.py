@@ -18,20 +18,93 @@ Glob patterns can have the following syntax:
 
 import re
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from functools import lru_cache
-from io import StringIO
-from typing import List, Iterator, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 
 GLOB_CHARACTERS = "*?{}[]!,/\\"
 
+_GLOB_CHAR_SET = frozenset(GLOB_CHARACTERS)
+# glob characters within path segments, without separators
+_PATTERN_CHAR_SET = _GLOB_CHAR_SET - {"/", "\\"}
+# segments resolved by the file system, never listed by scandir
+_SPECIAL_SEGMENTS = frozenset(("", ".", ".."))
+_ESCAPED_GLOB_CHARS = re.escape(GLOB_CHARACTERS)
+# one character inside a path segment
+_NEG_CLASS = f"[^{_ESCAPED_GLOB_CHARS}]"
+
+# file extension only pattern, e.g. '*.py'
+_SUFFIX_PATTERN = re.compile(r"\*\.[A-Za-z0-9_]+")
+
+# file extension alternatives pattern, e.g. '*.{py,pyc}'
+_EXTENSIONS_PATTERN = re.compile(r"\*\.\{([\w,]+)\}")
+
+# glob pattern tokens, any character left over is invalid
+_TOKENIZER = re.compile(
+    r"(?P<dstar>\*\*)"
+    r"|(?P<star>\*)"
+    r"|(?P<qmark>\?)"
+    r"|(?P<range>\[[^\]]*\])"
+    r"|(?P<lbrace>\{)"
+    r"|(?P<rbrace>\})"
+    r"|(?P<comma>,)"
+    f"|(?P<literal>[^{_ESCAPED_GLOB_CHARS}]+)"
+    r"|(?P<invalid>.)",
+    re.DOTALL,
+)
+
 
 class SegmentPattern:
     """path segment pattern"""
 
+    __slots__ = ("pattern", "regex_pattern", "_match", "match")
+
     def __init__(self, pattern: str):
         self.pattern = pattern
         self.regex_pattern = self._compile_pattern(pattern)
+        self.match: Callable[[str], bool] = self._match_regex
+
+        # truthy matcher for internal directory walk, without call wrapper
+        self._match: Callable[[str], Any] = self.regex_pattern.fullmatch
+
+        # skip the regex engine where the result is known without it
+        if pattern == "**":
+            self.match = self._match = lambda segment: True
+        elif _GLOB_CHAR_SET.isdisjoint(pattern):
+            self.match = self._match = lambda segment, literal=pattern: (
+                segment == literal
+            )
+        elif _SUFFIX_PATTERN.fullmatch(pattern):
+            # same as regex: one or more segment characters before suffix
+            self.match = self._match = lambda segment, suffix=pattern[1:]: (
+                len(segment) > len(suffix)
+                and segment.endswith(suffix)
+                and _GLOB_CHAR_SET.isdisjoint(segment)
+            )
+        elif match := _EXTENSIONS_PATTERN.fullmatch(pattern):
+            extensions = frozenset(match.group(1).split(","))
+
+            def match_extension(segment: str) -> bool:
+                stem, _, extension = segment.rpartition(".")
+                return (
+                    bool(stem)
+                    and extension in extensions
+                    and _GLOB_CHAR_SET.isdisjoint(segment)
+                )
+
+            self.match = self._match = match_extension
 
     def __repr__(self):
         return f"SegmentPattern(pattern={repr(self.pattern)})"
@@ -41,189 +114,190 @@ class SegmentPattern:
     def glob_to_regex(pattern: str) -> str:
         """convert glob to regular expression"""
 
-        offset = 0
-        escaped_glob_chars = re.escape(GLOB_CHARACTERS)
+        tokens = _TOKENIZER.finditer(pattern)
 
-        def get_text() -> str:
-            return pattern[offset:]
-
-        def parse_inline() -> str:
-            nonlocal offset
+        def parse(nested: bool) -> str:
+            alternatives = []
             pattern_block = []
 
-            while True:
-                sub_text = get_text()
-                if not sub_text:
-                    return "".join(pattern_block)
-
-                # match one or more characters
-                if match := re.match(r"\*", sub_text):
-                    offset += match.end()
-                    pattern_block.append(f"[^{escaped_glob_chars}]+")
-                    continue
-
-                # match exacty one character
-                if match := re.match(r"\?", sub_text):
-                    offset += match.end()
-                    pattern_block.append(f"[^{escaped_glob_chars}]{{1}}")
-                    continue
+            # nested calls consume the same token stream
+            for match in tokens:
+                kind = match.lastgroup
 
                 # match defined characters
-                if match := re.match(f"([^{escaped_glob_chars}]+)", sub_text):
-                    offset += match.end()
-                    pattern_block.append(re.escape(match.group(1)))
-                    continue
-
-                # else
-                return "".join(pattern_block)
+                if kind == "literal":
+                    pattern_block.append(re.escape(match.group()))
 
-        def parse_range() -> str:
-            nonlocal offset
-            pattern_block = []
+                # match one or more characters
+                elif kind == "star":
+                    pattern_block.append(f"{_NEG_CLASS}+")
 
-            while True:
-                sub_text = get_text()
-                # EOF
-                if not sub_text:
-                    # revert to original character
-                    if pattern_block[1] == "^":
-                        pattern_block[1] = "!"
-                    return "".join(pattern_block)
-
-                # open range
-                if match := re.match(r"\[", sub_text):
-                    offset += match.end()
-                    pattern_block.append("[")
-
-                    # negate to range
-                    # negate character only valid after open bracket
-                    sub_text = get_text()
-                    if match := re.match("!", sub_text):
-                        offset += match.end()
-                        pattern_block.append("^")
-
-                    continue
-
-                # close range
-                if match := re.match(r"\]", sub_text):
-                    offset += match.end()
-                    pattern_block.append("]")
-                    return "".join(pattern_block)
-
-                # range characters
-                if match := re.match(r"([^\[\]]+)", sub_text):
-                    offset += match.end()
-                    pattern_block.append(match.group(1))
-                    continue
-
-                raise ValueError(f"invalid range characters: {repr(sub_text)}")
-
-        def parse_subpattern() -> str:
-            nonlocal offset
-            pattern_block = []
-            enter_scope = False
+                # match any characters, only valid as whole segment
+                elif kind == "dstar":
+                    if match.start() == 0:
+                        if match.end() < len(pattern):
+                            raise ValueError(f"invalid pattern: {repr(pattern)}")
+                        return ".*"
+                    pattern_block.append(f"{_NEG_CLASS}+" * 2)
 
-            while True:
-                sub_text = get_text()
+                # match exacty one character
+                elif kind == "qmark":
+                    pattern_block.append(f"{_NEG_CLASS}{{1}}")
 
-                # EOF
-                if not sub_text:
-                    text = ",".join(pattern_block)
-                    return f"{{{text}"
+                # match range, negate character only valid after open bracket
+                elif kind == "range":
+                    text = match.group()[1:-1]
+                    if text.startswith("!"):
+                        text = f"^{text[1:]}"
+                    pattern_block.append(f"[{text}]")
 
                 # open sub pattern
-                if match := re.match(r"\{", sub_text):
-                    offset += match.end()
-
-                    if enter_scope:
-                        # parse nested sub pattern
-                        text = "".join((parse_subpattern(), parse_inline()))
-                        try:
-                            pattern_block[-1] = "".join((pattern_block[-1], text))
-                        except IndexError:
-                            pattern_block = [text]
-
-                    enter_scope = True
-                    continue
+                elif kind == "lbrace":
+                    pattern_block.append(parse(nested=True))
 
                 # next sub pattern item
-                if match := re.match(r"\,", sub_text):
-                    offset += match.end()
-                    continue
+                elif nested and kind == "comma":
+                    alternatives.append("".join(pattern_block))
+                    pattern_block = []
 
                 # close sub pattern
-                if match := re.match(r"\}", sub_text):
-                    offset += match.end()
-                    text = "|".join(pattern_block)
+                elif nested and kind == "rbrace":
+                    alternatives.append("".join(pattern_block))
+                    text = "|".join(alternatives)
                     return f"(?:{text})"
 
-                # match range
-                if match := re.match(r"\[", sub_text):
-                    text = "".join((parse_range(), parse_inline()))
-                    try:
-                        pattern_block[-1] = "".join((pattern_block[-1], text))
-                    except IndexError:
-                        pattern_block = [text]
-                    continue
-
-                # sub pattern charaters
-                if sub_pattern := parse_inline():
-                    pattern_block.append(sub_pattern)
-                    continue
-
-                raise ValueError(f"invalid segment characters: {repr(sub_text)}")
-
-        tmp_pattern = []
-        while True:
-            text = pattern[offset:]
-            if not text:
-                break
-
-            # match any characters
-            if match := re.match(r"\*\*", text):
-                offset += match.end()
-                tmp_pattern.append(".*")
-                if text[offset:]:
-                    raise ValueError(f"invalid pattern: {repr(text)}")
-                break
-
-            # match sub pattern
-            if match := re.match(r"\{", text):
-                sub_pattern = parse_subpattern()
-                tmp_pattern.append(sub_pattern)
-                continue
-
-            # match range
-            if match := re.match(r"\[", text):
-                sub_pattern = parse_range()
-                tmp_pattern.append(sub_pattern)
-                continue
-
-            if sub_pattern := parse_inline():
-                tmp_pattern.append(sub_pattern)
-                continue
-
-            raise ValueError(f"invalid segment characters: {repr(text)}")
-
-        return "".join(tmp_pattern)
+                else:
+                    text = pattern[match.start() :]
+                    raise ValueError(f"invalid segment characters: {repr(text)}")
+
+            if nested:
+                raise ValueError(f"invalid sub pattern: {repr(pattern)}")
+
+            return "".join(pattern_block)
+
+        return parse(nested=False)
 
     def _compile_pattern(self, pattern: str) -> re.Pattern:
         regex = self.glob_to_regex(self.pattern)
-        return re.compile(f"^{regex}$")
+        return re.compile(regex)
 
-    def match(self, segment: str) -> bool:
-        return bool(self.regex_pattern.match(segment))
+    def _match_regex(self, segment: str) -> bool:
+        return self._match(segment) is not None
 
 
 class DirectorySegment(SegmentPattern):
     """Directory segment"""
 
+    __slots__ = ()
+
 
 class FileSegment(SegmentPattern):
     """File segment"""
 
+    __slots__ = ()
+
+
+class MultiFileSegment(FileSegment):
+    """File segment matching any of file patterns"""
+
+    __slots__ = ("patterns",)
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+        # for display only, not a glob pattern
+        self.pattern = " | ".join(self.patterns)
+
+        # union of each pattern regex compiled once
+        regex = "|".join(self.glob_to_regex(item) for item in self.patterns)
+        self.regex_pattern = re.compile(f"(?:{regex})")
+        self.match = self._match_regex
+        self._match = self.regex_pattern.fullmatch
+
+    def __repr__(self):
+        return f"MultiFileSegment(patterns={repr(self.patterns)})"
+
+
+@lru_cache(512)
+def _get_segment(cls: Type[SegmentPattern], pattern: str) -> SegmentPattern:
+    """get cached segment instance, keyed by segment class and pattern"""
+    return cls(pattern)
+
+
+def _iter_segments(pattern: str) -> Iterator[Tuple[Type[SegmentPattern], str]]:
+    """iterate segment class and text, the last segment is file segment"""
+
+    start = 0
+    while (end := pattern.find("/", start)) >= 0:
+        yield DirectorySegment, pattern[start:end]
+        start = end + 1
+
+    yield FileSegment, pattern[start:]
+
 
-def glob1(root_path: str, segments: List[SegmentPattern]):
+@lru_cache(256)
+def _parse_pattern(pattern: str) -> Tuple[SegmentPattern, ...]:
+    """parse normalized pattern to segments"""
+    return tuple(_get_segment(cls, text) for cls, text in _iter_segments(pattern))
+
+
+def _walk_files(root_path: str, match_file: Callable[[str], Any]) -> Iterator[str]:
+    """match file names in the whole directory tree, without directory patterns"""
+
+    pending = [root_path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(entry.path)
+                elif match_file(entry.name):
+                    yield entry.path
+
+
+def _scan_directory(
+    root_path: str, segments: Sequence[SegmentPattern]
+) -> Tuple[List[str], List[Tuple[str, Sequence[SegmentPattern]]]]:
+    """match one directory level
+
+    Returns matched files and subdirectories to walk with their segments.
+    """
+
+    # invariant across directory entries
+    first = segments[0]
+    is_dir_segment = isinstance(first, DirectorySegment)
+    is_double_star = is_dir_segment and first.pattern == "**"
+    next_segments = segments[1:]
+    match_directory = first._match
+
+    # match any subpattern ('**/<any_characters>') or file segment
+    match_file = segments[1]._match if is_double_star else first._match
+
+    files = []
+    directories = []
+
+    # scandir entries carry the file type read with the directory listing,
+    # so no extra stat call is needed per entry. The type is checked once,
+    # anything not a directory is matched as file.
+    with os.scandir(root_path) as entries:
+        for entry in entries:
+            is_dir = entry.is_dir()
+            if is_dir:
+                if not is_dir_segment:
+                    raise ValueError(
+                        "segments must start with <class 'DirectorySegment'>"
+                    )
+
+                if is_double_star:
+                    directories.append((entry.path, segments))
+                elif match_directory(entry.name):
+                    directories.append((entry.path, next_segments))
+
+            elif match_file(entry.name):
+                files.append(entry.path)
+
+    return files, directories
+
+
+def glob1(root_path: str, segments: Sequence[SegmentPattern]):
     """glob with defined path and patterns
 
     Limitation:
@@ -233,35 +307,80 @@ def glob1(root_path: str, segments: List[SegmentPattern]):
         **/coo/**/*.py  ( unexpected result! )
     """
 
-    def walk_directory(name: str):
-        if not isinstance(segments[0], DirectorySegment):
-            raise ValueError("segments must start with <class 'DirectorySegment'>")
+    # '**/<file_segment>' matches every directory, only file names are checked
+    first = segments[0]
+    if len(segments) == 2 and isinstance(first, DirectorySegment):
+        if first.pattern == "**":
+            yield from _walk_files(root_path, segments[1]._match)
+            return
+
+    files, directories = _scan_directory(root_path, segments)
+    yield from files
+    for path, sub_segments in directories:
+        yield from glob1(path, sub_segments)
+
+
+def _glob_threaded(
+    root_path: str, segments: Sequence[SegmentPattern], max_workers: int
+) -> Iterator[str]:
+    """glob1 with directories scanned concurrently by a thread pool"""
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = {executor.submit(_scan_directory, root_path, segments)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, directories = future.result()
+                    for path, sub_segments in directories:
+                        pending.add(
+                            executor.submit(_scan_directory, path, sub_segments)
+                        )
+                    yield from files
+
+        finally:
+            # stop queued scans if caller stop iteration
+            for future in pending:
+                future.cancel()
+
+
+def _iglob_segments(
+    root_path: str, segments: Sequence[SegmentPattern], max_workers: int
+) -> Iterator[str]:
+    # single segment only scan root directory
+    if max_workers <= 1 or len(segments) <= 1:
+        return glob1(root_path, segments)
+    return _glob_threaded(root_path, segments, max_workers)
+
+
+def _glob_literal(pattern: str, cwd: str) -> Optional[List[str]]:
+    """check literal normalized pattern directly, None if not literal
+
+    Empty, '.' and '..' segments never match a directory entry,
+    those are left to the directory walk.
+    """
 
-        path = os.path.join(root_path, name)
-        if segments[0].pattern == "**":
-            yield from glob1(path, segments)
-        elif segments[0].match(name):
-            yield from glob1(path, segments[1:])
+    if not _PATTERN_CHAR_SET.isdisjoint(pattern):
+        return None
 
-    def match_file(name: str):
-        # match any subpattern ('**/<any_characters>')
-        if isinstance(segments[0], DirectorySegment) and segments[0].pattern == "**":
-            return segments[1].match(name)
+    names = pattern.split("/")
+    if not _SPECIAL_SEGMENTS.isdisjoint(names):
+        return None
 
-        # match file segment
-        return segments[0].match(name)
+    path = os.path.join(cwd, *names)
+    if os.path.lexists(path) and not os.path.isdir(path):
+        return [path]
+    return []
 
-    for name in os.listdir(root_path):
-        absolute_path = os.path.join(root_path, name)
-        if os.path.isdir(absolute_path):
-            yield from walk_directory(name)
-        else:
-            if match_file(name):
-                yield absolute_path
 
+def iglob(
+    pattern: str, cwd: Optional[str] = None, max_workers: int = 1
+) -> Iterator[str]:
+    """iterable glob
 
-def iglob(pattern: str, cwd: Optional[str] = None) -> Iterator[str]:
-    """iterable glob"""
+    With `max_workers` greater than 1, directories are scanned concurrently,
+    which pays off on slow (e.g. network) file systems.
+    """
 
     if not pattern.strip():
         raise ValueError("pattern empty")
@@ -269,13 +388,57 @@ def iglob(pattern: str, cwd: Optional[str] = None) -> Iterator[str]:
     # normalize to unix separator
     pattern = pattern.replace("\\", "/")
 
-    *dir_segments, file_segment = pattern.split("/")
-    segments = [DirectorySegment(segment) for segment in dir_segments]
-    segments.append(FileSegment(file_segment))
     cwd = cwd or os.getcwd()
-    yield from glob1(cwd, segments)
+
+    if (literal_paths := _glob_literal(pattern, cwd)) is not None:
+        yield from literal_paths
+        return
+
+    segments = _parse_pattern(pattern)
+    yield from _iglob_segments(cwd, segments, max_workers)
+
+
+def iglob_many(
+    patterns: Iterable[str], cwd: Optional[str] = None, max_workers: int = 1
+) -> Iterator[str]:
+    """iterable glob matching any of patterns
+
+    Patterns with the same directory segments share one directory traversal.
+    """
+
+    cwd = cwd or os.getcwd()
+
+    # literal paths checked directly, others grouped by directory segments
+    literal_paths: List[str] = []
+    groups: Dict[Tuple[SegmentPattern, ...], List[str]] = {}
+    for pattern in patterns:
+        if not pattern.strip():
+            raise ValueError("pattern empty")
+
+        # normalize to unix separator
+        pattern = pattern.replace("\\", "/")
+
+        if (paths := _glob_literal(pattern, cwd)) is not None:
+            literal_paths.extend(paths)
+            continue
+
+        *dir_segments, file_segment = _parse_pattern(pattern)
+        groups.setdefault(tuple(dir_segments), []).append(file_segment.pattern)
+
+    found = set()
+    for path in literal_paths:
+        if path not in found:
+            found.add(path)
+            yield path
+
+    for dir_segments, file_patterns in groups.items():
+        segments = (*dir_segments, MultiFileSegment(file_patterns))
+        for path in _iglob_segments(cwd, segments, max_workers):
+            if path not in found:
+                found.add(path)
+                yield path
 
 
-def glob(pattern: str, cwd: Optional[str] = None) -> List[str]:
+def glob(pattern: str, cwd: Optional[str] = None, max_workers: int = 1) -> List[str]:
     """glob"""
-    return list(iglob(pattern, cwd))
+    return list(iglob(pattern, cwd, max_workers))
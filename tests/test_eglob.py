@@ -1,6 +1,8 @@
+import os
+
 import pytest
 
-from eglob import SegmentPattern
+from eglob import SegmentPattern, MultiFileSegment, glob, iglob_many
 
 test_segment_data = [
     # test directory
@@ -10,14 +12,20 @@ test_segment_data = [
     ("*conda", "anaconda3", False),
     # test file
     ("*.py", "app.py", True),
+    ("*.py", ".py", False),
+    ("*.py", "app.pyc", False),
     ("*.{py,pyc}", "main.py", True),
     ("*.{py,pyc}", "cache.pyc", True),
     ("*.{py,pyc}", "cache.pyo", False),
+    ("*.{py,pyc}", ".pyc", False),
+    ("*.{py,pyc}", "cache.py.pyc", True),
     ("tmp?", "tmp12", False),
     ("tmp?", "tmp1", True),
     ("user[1-5].py", "user1.py", True),
     ("user[!1-5].py", "user1.py", False),
     ("user[!1-5].py", "user6.py", True),
+    ("{a,[0-9]}", "5", True),
+    ("{a,{b,c}}", "c", True),
 ]
 
 
@@ -25,3 +33,95 @@ test_segment_data = [
 def test_segment_match(pattern, test_input, expected):
     segment = SegmentPattern(pattern)
     assert segment.match(test_input) is expected
+
+
+@pytest.mark.parametrize(
+    "pattern,test_input,expected",
+    [
+        ("src", "src", True),
+        ("src", "src2", False),
+        ("app.py", "app.py", True),
+        ("app.py", "appxpy", False),
+        ("**", "", True),
+    ],
+)
+def test_segment_match_literal(pattern, test_input, expected):
+    segment = SegmentPattern(pattern)
+    assert segment.match(test_input) is expected
+
+
+@pytest.mark.parametrize("pattern", ["x[", "*.{py", "a!b", "**x"])
+def test_segment_invalid(pattern):
+    with pytest.raises(ValueError):
+        SegmentPattern(pattern)
+
+
+def test_multi_file_segment_match():
+    segment = MultiFileSegment(["*.py", "*.pyc"])
+    assert segment.match("main.py") is True
+    assert segment.match("cache.pyc") is True
+    assert segment.match("cache.pyo") is False
+    assert segment.patterns == ("*.py", "*.pyc")
+
+
+def test_iglob_many_double_star(tmp_path):
+    (tmp_path / "a.py").touch()
+
+    assert list(iglob_many(["**"], str(tmp_path))) == glob("**", str(tmp_path))
+
+
+def test_iglob_many(tmp_path):
+    (tmp_path / "src").mkdir()
+    for name in ("a.py", "b.js", "c.txt", "src/d.py", "src/e.js"):
+        (tmp_path / name).touch()
+
+    found = iglob_many(["**/*.py", "**/*.js", "src/*.py"], str(tmp_path))
+    assert sorted(os.path.relpath(path, tmp_path) for path in found) == [
+        "a.py",
+        "b.js",
+        os.path.join("src", "d.py"),
+        os.path.join("src", "e.js"),
+    ]
+
+
+def test_glob_max_workers(tmp_path):
+    for name in ("a", "a/b", "c"):
+        (tmp_path / name).mkdir()
+    for name in ("x.py", "a/y.py", "a/b/z.py", "c/w.txt"):
+        (tmp_path / name).touch()
+
+    expected = sorted(glob("**/*.py", str(tmp_path)))
+    assert len(expected) == 3
+    assert sorted(glob("**/*.py", str(tmp_path), max_workers=4)) == expected
+
+
+def test_glob_literal_path(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").touch()
+
+    assert glob("src/app.py", str(tmp_path)) == [str(tmp_path / "src" / "app.py")]
+    assert glob("src/main.py", str(tmp_path)) == []
+    assert glob("src", str(tmp_path)) == []
+
+    # same literal check for several patterns, next to a subdirectory
+    (tmp_path / "src" / "pkg").mkdir()
+    assert list(iglob_many(["src/app.py", "src/app.py"], str(tmp_path))) == [
+        str(tmp_path / "src" / "app.py")
+    ]
+
+    # segments never listed by the directory walk don't resolve either
+    (tmp_path / "a.py").touch()
+    cwd = str(tmp_path / "src")
+    assert glob("../a.py", cwd) == glob("../*.py", cwd) == []
+    assert glob("./app.py", cwd) == glob("./*.py", cwd) == []
+    assert glob("src//app.py", str(tmp_path)) == []
+
+
+@pytest.mark.parametrize("pattern", ["**/*.py", "**/b/*.py"])
+def test_glob_symlink_loop(tmp_path, pattern):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "x.py").touch()
+    (tmp_path / "a" / "loop").symlink_to("..")
+
+    with pytest.raises(OSError):
+        glob(pattern, str(tmp_path))